@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+    Microbenchmark of links normalization and junk scoring
+
+    python3 benchmarks/bench_links.py [count]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from marple import Link, junk_regexps, junk_end_symbols, username_marks_symbols
+
+
+URL_TEMPLATES = [
+    'https://github.com/{name}',
+    'https://t.me/{name}?ref_src=twsrc',
+    'https://www.reddit.com/user/{name}/submitted/',
+    'https://{name}.medium.com/about?via=twitter&page={i}',
+    'https://giters.com/{name}?tab=followers&after={i}',
+    'https://fruitssupplier.com/app/webroot/img/files/{name}-{i}.pdf',
+    'https://example.com/search/page/{i}',
+]
+
+
+# baseline implementation: uncompiled regexps and scores recomputed on every access
+class BaselineLink:
+    def __init__(self, url, title, username, source=''):
+        self.url = url.lower()
+        self.title = title
+        self.name = username.lower()
+        self.source = source
+        url = self.url
+        for r in junk_regexps:
+            url = re.sub(r, '', url)
+        self.url = url.rstrip(junk_end_symbols)
+
+    def username_profile_symbols(self):
+        if self.name not in self.url:
+            return '', ''
+
+        left_symbol = self.url[self.url.index(self.name)-1]
+        right_symbol = ''
+
+        if len(self.url) > self.url.index(self.name)+len(self.name):
+            right_symbol = self.url[self.url.index(self.name)+len(self.name)]
+
+        return left_symbol, right_symbol
+
+    @property
+    def junk_score(self):
+        left_symbol, right_symbol = self.username_profile_symbols()
+        symbols_score = sum(
+            username_marks_symbols.index(i)
+            for i in left_symbol + right_symbol
+            if i in username_marks_symbols
+        )
+
+        name_index = self.name in self.url and self.url.index(self.name) * 3 or 0
+        return len(self.url.split('?')[0]) + symbols_score * 10 + name_index
+
+    def is_it_likely_username_profile(self):
+        left_symbol, right_symbol = self.username_profile_symbols()
+
+        return (left_symbol + right_symbol).strip(username_marks_symbols) == ''
+
+
+def make_urls(count, name='soxoj'):
+    return [
+        URL_TEMPLATES[i % len(URL_TEMPLATES)].format(name=name, i=i)
+        for i in range(count)
+    ]
+
+
+def run(link_class, urls, threshold=300):
+    start = time.perf_counter()
+    links = [link_class(u, '', 'soxoj') for u in urls]
+    links = sorted(links, key=lambda x: x.junk_score)
+    reliable = [
+        l for l in links
+        if l.is_it_likely_username_profile() and l.junk_score <= threshold
+    ]
+    return time.perf_counter() - start, links, reliable
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    urls = make_urls(count)
+
+    baseline_time, baseline_links, baseline_reliable = run(BaselineLink, urls)
+    new_time, new_links, new_reliable = run(Link, urls)
+
+    assert [l.url for l in baseline_links] == [l.url for l in new_links]
+    assert len(baseline_reliable) == len(new_reliable)
+
+    print(f'links: {count}')
+    print(f'baseline: {baseline_time:.3f}s')
+    print(f'current: {new_time:.3f}s')
+    print(f'speedup: {baseline_time / new_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
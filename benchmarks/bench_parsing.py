@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+    Benchmark of HTML parsing backends on saved search results pages
+
+    python3 benchmarks/bench_parsing.py [repeats]
+"""
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from marple import html_backends, html_backend_modules, parse_google_serp, parse_duckduckgo_serp
+
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+
+PAGES = {
+    'google_serp.html': parse_google_serp,
+    'duckduckgo_serp.html': parse_duckduckgo_serp,
+}
+
+
+def available_backends():
+    backends = []
+    for name in html_backends:
+        try:
+            __import__(html_backend_modules.get(name, name))
+        except ImportError:
+            continue
+        backends.append(name)
+
+    return backends
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    report = {}
+
+    for filename, parse_func in PAGES.items():
+        with open(os.path.join(FIXTURES, filename), encoding='utf-8') as f:
+            html = f.read()
+
+        page_report = {'size_kb': round(len(html) / 1024, 1)}
+        for backend in available_backends():
+            start = time.perf_counter()
+            for _ in range(repeats):
+                results = parse_func(html, backend)
+            elapsed = (time.perf_counter() - start) / repeats
+
+            page_report[backend] = {
+                'ms_per_page': round(elapsed * 1000, 3),
+                'results': len(results),
+            }
+
+        if 'bs4' in page_report:
+            for backend in available_backends():
+                page_report[backend]['speedup'] = round(
+                    page_report['bs4']['ms_per_page'] / page_report[backend]['ms_per_page'], 2
+                )
+
+        report[filename] = page_report
+
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+    Startup benchmark: import time of marple module (python -X importtime)
+    and wall time of a short CLI call, printed as JSON
+
+    python3 benchmarks/bench_startup.py [--runs 5] [--max-import-ms 150]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def import_times():
+    """
+        Returns {module: cumulative import time in us} for one fresh interpreter
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import marple'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def cli_time():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'marple.py', '--help'], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser(description='Marple startup benchmark')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Count of the slowest imported modules to show')
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='Exit with error if median import time is bigger')
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    import_ms = statistics.median(r['marple'] for r in runs) / 1000
+    cli_ms = statistics.median(cli_time() for _ in range(args.runs)) * 1000
+
+    last = runs[-1]
+    top = sorted(
+        ((m, t) for m, t in last.items() if m != 'marple'),
+        key=lambda x: x[1], reverse=True,
+    )[:args.top]
+
+    print(json.dumps({
+        'import_ms': round(import_ms, 2),
+        'cli_help_ms': round(cli_ms, 2),
+        'modules_count': len(last),
+        'slowest_modules_ms': {m: round(t / 1000, 2) for m, t in top},
+    }, indent=4))
+
+    if args.max_import_ms and import_ms > args.max_import_ms:
+        print(f'Import time {import_ms:.2f}ms is over the limit {args.max_import_ms}ms', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+    Offline benchmark of the whole pipeline: marple() run with replayed
+    responses of Google and SDK engines (Yandex, Naver, Baidu), HTML parsing
+    backends and links post-processing (scoring, merging, sorting) for lists
+    and compact tables, sequential and sharded between processes
+
+    python3 benchmarks/bench_suite.py [--sizes 1000 100000 1000000] [--output report.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import marple as marple_module
+from marple import (
+    GoogleParser, Link, LinkTable, RecordedResponse, RecordingSessionPool, ReplaySessionPool,
+    marple, merge_links, merge_links_sharded, run_in_process, sort_links, write_recording,
+)
+from bench_links import make_urls
+from bench_parsing import available_backends
+
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+USERNAME = 'soxoj'
+ENGINES = ['google', 'yandex', 'naver', 'baidu']
+SDK_ENV = {'YANDEX_USER': 'bench', 'YANDEX_KEY': 'bench', 'SERPAPI_KEY': 'bench'}
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {
+        'seconds': round(elapsed, 4),
+        'peak_memory_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+def fake_sdk_send(session, request, **kwargs):
+    """
+        SerpApi and Yandex XML backends with a page of generated results
+    """
+    import requests
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = request.url
+    response.request = request
+    urls = make_urls(50, USERNAME)
+
+    if request.url.startswith('https://serpapi.com/'):
+        results = [{'link': u, 'title': USERNAME} for u in urls]
+        response._content = json.dumps({'organic_results': results}).encode()
+    else:
+        docs = ''.join(
+            f'<group><doc><url>{u}</url><domain>{u.split("/")[2]}</domain><title>{USERNAME}</title></doc></group>'
+            for u in urls
+        )
+        response._content = (
+            f'<yandexsearch><response date="20260101T000000"><reqid>1</reqid>'
+            f'<found priority="all">50</found><results><grouping>{docs}</grouping></results>'
+            f'</response></yandexsearch>'
+        ).encode()
+
+    return response
+
+
+async def run_marple(session_pool, engines):
+    try:
+        return await marple(USERNAME, 100, True, custom_engines=engines, progress=False,
+                            session_pool=session_pool)
+    finally:
+        await session_pool.close()
+
+
+def record_responses(path):
+    with open(os.path.join(FIXTURES, 'google_serp.html'), 'rb') as f:
+        html = f.read()
+
+    url = GoogleParser().make_url(USERNAME, 100, 'en')
+    write_recording(path, 'GET', url, RecordedResponse(200, {}, html))
+
+    # SDK engines are recorded from generated responses instead of the paid APIs
+    with mock.patch('requests.Session.send', fake_sdk_send):
+        asyncio.run(run_marple(RecordingSessionPool(path), ENGINES[1:]))
+
+
+def bench_pipeline(repeats):
+    report = {}
+    with tempfile.TemporaryDirectory() as path, mock.patch.dict(os.environ, SDK_ENV):
+        record_responses(path)
+
+        for backend in available_backends():
+            marple_module.html_backend = backend
+            timings = []
+            for _ in range(repeats):
+                result, stats = measure(asyncio.run, run_marple(ReplaySessionPool(path), ENGINES))
+                timings.append(stats)
+
+            report[backend] = {
+                'ms_per_run': round(sum(t['seconds'] for t in timings) / repeats * 1000, 3),
+                'peak_memory_mb': max(t['peak_memory_mb'] for t in timings),
+                'links': len(result.unique_links),
+            }
+
+    marple_module.html_backend = None
+    return report
+
+
+async def merge_table_sharded(table):
+    # processes are started before the measured merge, the same as in long batch runs
+    await run_in_process(len, [])
+    return await merge_links_sharded(table, True, partitions=os.cpu_count())
+
+
+def bench_links(sizes):
+    report = {}
+    for size in sizes:
+        urls = make_urls(size, USERNAME)
+        size_report = {}
+
+        links, size_report['create'] = measure(lambda: [Link(u, '', USERNAME) for u in urls])
+        _, size_report['table'] = measure(LinkTable.from_links, links, USERNAME)
+        merged, size_report['merge'] = measure(merge_links, links, USERNAME, True)
+        _, size_report['sort'] = measure(sort_links, merged)
+
+        table = LinkTable.from_links(links, USERNAME)
+        merged, size_report['merge_table'] = measure(merge_links, table, USERNAME, True)
+        _, size_report['sort_table'] = measure(sort_links, merged)
+        _, size_report['merge_sharded'] = measure(asyncio.run, merge_table_sharded(table))
+
+        report[size] = size_report
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite of marple')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help='Counts of links for post-processing benchmarks')
+    parser.add_argument('--repeats', type=int, default=5,
+                        help='Count of replayed marple() runs for every HTML backend')
+    parser.add_argument('--output', type=str, default='',
+                        help='Save JSON report to the file instead of printing')
+    args = parser.parse_args()
+
+    report = {
+        'pipeline': bench_pipeline(args.repeats),
+        'links': bench_links(args.sizes),
+    }
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+from marple import *
+
+
+def test_serp_cache_hit(tmp_path):
+    cache = SerpCache(str(tmp_path / 'cache.sqlite'))
+    links = [Link('https://t.me/soxoj', 'Telegram', 'soxoj', source='Google')]
+
+    assert cache.get('Google scraping', 'soxoj', 100, 'en') is None
+
+    cache.set('Google scraping', 'soxoj', 100, 'en', links)
+    cached = cache.get('Google scraping', 'soxoj', 100, 'en')
+
+    assert [(l.url, l.title, l.source) for l in cached] == [('https://t.me/soxoj', 'Telegram', 'Google')]
+    assert cache.get('Google scraping', 'soxoj', 10, 'en') is None
+
+
+def test_serp_cache_ttl(tmp_path):
+    cache = SerpCache(str(tmp_path / 'cache.sqlite'), ttl=-1)
+    cache.set('Google scraping', 'soxoj', 100, 'en', [])
+
+    assert cache.get('Google scraping', 'soxoj', 100, 'en') is None
+
+
+def test_serp_cache_lru_eviction(tmp_path):
+    cache = SerpCache(str(tmp_path / 'cache.sqlite'), max_entries=2)
+    cache.set('Google scraping', 'a', 100, 'en', [])
+    cache.set('Google scraping', 'b', 100, 'en', [])
+    cache.get('Google scraping', 'a', 100, 'en')
+    cache.set('Google scraping', 'c', 100, 'en', [])
+
+    assert cache.get('Google scraping', 'a', 100, 'en') == []
+    assert cache.get('Google scraping', 'b', 100, 'en') is None
+    assert cache.get('Google scraping', 'c', 100, 'en') == []
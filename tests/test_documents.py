@@ -0,0 +1,72 @@
+import asyncio
+import io
+
+import aiohttp
+from aiohttp import web
+from PyPDF2 import PdfWriter
+
+from marple import *
+
+
+def make_pdf():
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    writer.add_metadata({'/Title': 'Social OSINT fundamentals', '/Author': 'soxoj'})
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def test_read_pdf_info_from_tail():
+    data = make_pdf()
+
+    assert read_pdf_info(data[-200:]) is None
+    assert read_pdf_info(data)['/Author'] == 'soxoj'
+    assert read_pdf_metadata(data)['/Title'] == 'Social OSINT fundamentals'
+
+
+def test_pdf_metadata_links(tmp_path):
+    pdf_file = tmp_path / 'doc.pdf'
+    pdf_file.write_bytes(make_pdf())
+    requests_count = {'range': 0, 'full': 0}
+
+    async def ranged(request):
+        requests_count['range'] += 1
+        return web.FileResponse(pdf_file)
+
+    async def full(request):
+        requests_count['full'] += 1
+        return web.Response(body=pdf_file.read_bytes())
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/ranged.pdf', ranged)
+        app.router.add_get('/full.pdf', full)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        cache = DocumentCache(str(tmp_path / 'cache'))
+        links = [
+            Link(f'http://127.0.0.1:{port}/ranged.pdf', '', 'doc'),
+            Link(f'http://127.0.0.1:{port}/full.pdf', '', 'doc'),
+        ]
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                errors = await pdf_metadata_links(links, session, cache)
+                # all the metadata is cached now
+                again = [Link(l.url, '', 'doc') for l in links]
+                await pdf_metadata_links(again, session, DocumentCache(str(tmp_path / 'cache')))
+        finally:
+            await runner.cleanup()
+
+        return links, again, errors
+
+    links, again, errors = asyncio.run(run())
+
+    assert errors == []
+    assert [l.metadata['/Author'] for l in links + again] == ['soxoj'] * 4
+    assert requests_count == {'range': 1, 'full': 1}
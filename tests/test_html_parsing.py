@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from marple import *
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('backend', ['selectolax', 'lxml'])
+def test_html_backends_same_as_bs4(backend):
+    pytest.importorskip(html_backend_modules[backend])
+
+    google = read_fixture('google_serp.html')
+    duckduckgo = read_fixture('duckduckgo_serp.html')
+
+    assert len(parse_google_serp(google, 'bs4')) == 100
+    assert parse_google_serp(google, backend) == parse_google_serp(google, 'bs4')
+
+    assert len(parse_duckduckgo_serp(duckduckgo, 'bs4')) == 30
+    assert parse_duckduckgo_serp(duckduckgo, backend) == parse_duckduckgo_serp(duckduckgo, 'bs4')
@@ -0,0 +1,52 @@
+import asyncio
+
+import marple as marple_module
+from marple import *
+
+
+class CountingParser:
+    def __init__(self, name, url, error=None):
+        self.name = name
+        self.url = url
+        self.error = error
+        self.calls = []
+
+    async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+        self.calls.append(username)
+        if self.error:
+            return self.name, self.error
+
+        storage.append(Link(self.url.format(username), '', username, source=self.name))
+
+
+def test_restarted_batch_skips_done_units(tmp_path, monkeypatch):
+    filename = str(tmp_path / 'journal.sqlite')
+    captcha = 'captcha page instead of results'
+
+    def run(parsers):
+        monkeypatch.setattr(marple_module, 'make_parsers', lambda engines: parsers)
+
+        async def collect():
+            journal = JobJournal(filename)
+            results = marple_batch(['soxoj', 'alex'], 100, True, journal=journal, retries=0)
+            collected = {r.username: sorted(l.url for l in r.unique_links) async for r in results}
+            journal.close()
+            return collected
+
+        return asyncio.run(collect())
+
+    github = CountingParser('GitHub', 'https://github.com/{}')
+    telegram = CountingParser('Telegram', 'https://t.me/{}', error=captcha)
+    first = run([github, telegram])
+
+    assert first == {'soxoj': ['https://github.com/soxoj'], 'alex': ['https://github.com/alex']}
+    assert JobJournal(filename).summary() == {'done': 2, 'failed': 2}
+
+    github = CountingParser('GitHub', 'https://github.com/{}')
+    telegram = CountingParser('Telegram', 'https://t.me/{}')
+    second = run([github, telegram])
+
+    assert github.calls == []
+    assert sorted(telegram.calls) == ['alex', 'soxoj']
+    assert second['soxoj'] == ['https://github.com/soxoj', 'https://t.me/soxoj']
+    assert JobJournal(filename).summary() == {'done': 4}
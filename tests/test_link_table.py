@@ -0,0 +1,84 @@
+import asyncio
+import csv
+import io
+
+from marple import *
+
+
+URLS = [
+    'https://github.com/soxoj',
+    'https://github.com/soxoj/maigret',
+    'https://t.me/soxoj?ref_src=twsrc',
+    'https://www.reddit.com/user/soxoj/submitted',
+    'https://fruitssupplier.com/app/webroot/img/files/soxoj.pdf',
+    'https://books.google.ru/soxoj',
+    'https://example.com/about',
+]
+
+
+def make_links():
+    return [Link(u, f'title {i}', 'soxoj', source='Google' if i % 2 else 'Bing') for i, u in enumerate(URLS)]
+
+
+def test_link_has_no_dict():
+    assert not hasattr(Link('https://t.me/soxoj', '', 'soxoj'), '__dict__')
+
+
+def test_link_table_merge_and_sort_as_list():
+    links = sort_links(merge_links(make_links(), 'soxoj'))
+    table = sort_links(merge_links(LinkTable.from_links(make_links(), 'soxoj'), 'soxoj'))
+
+    assert len(table) == len(links) == 6
+    assert table.urls == [l.url for l in links]
+    assert list(table.scores) == [l.junk_score for l in links]
+    assert [l.filtered for l in table] == [l.filtered for l in links]
+    assert table.source_names == ['Bing', 'Google']
+    assert [table.is_likely_profile(i, 300) for i in range(len(table))] == \
+        [is_likely_profile(l, 300) for l in links]
+
+
+def test_link_table_csv_rows():
+    links = sort_links(merge_links(make_links(), 'soxoj'))
+    table = sort_links(merge_links(LinkTable.from_links(make_links(), 'soxoj'), 'soxoj'))
+
+    def rows(unique_links):
+        output = io.StringIO()
+        write_csv_rows(csv.writer(output), MarpleResult([], unique_links, [], [], 'soxoj'), 300)
+        return output.getvalue()
+
+    assert rows(table) == rows(links)
+
+
+def test_link_table_extend_with_table():
+    first = LinkTable.from_links(make_links()[:3], 'soxoj')
+    second = merge_links(LinkTable.from_links(make_links()[3:] + make_links()[:1], 'soxoj'), 'soxoj')
+    second.ids[0] = {'uid': '1'}
+
+    table = LinkTable('soxoj')
+    table += first
+    table += second
+
+    assert [l.to_dict() for l in table] == [l.to_dict() for l in list(first) + list(second)]
+    assert table.source_names == ['Bing', 'Google']
+
+
+def test_marple_compact_appends_to_table():
+    class ListParser:
+        def __init__(self, name, links):
+            self.name = name
+            self.links = links
+
+        async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+            storage += self.links
+
+    def run(compact):
+        links = make_links()
+        parsers = [ListParser('Bing', links[:4]), ListParser('Google', links[3:])]
+        return asyncio.run(marple('soxoj', 100, True, progress=False, parsers=parsers, compact=compact))
+
+    result, compact = run(False), run(True)
+
+    assert isinstance(compact.all_links, LinkTable)
+    assert sorted(compact.all_links.urls) == sorted(l.url for l in result.all_links)
+    assert sorted(compact.unique_links.urls) == sorted(l.url for l in result.unique_links)
+    assert {name: m.unique_count for name, m in compact.metrics.items()} == {'Bing': 4, 'Google': 3}
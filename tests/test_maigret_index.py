@@ -0,0 +1,61 @@
+import pickle
+import re
+
+from marple import *
+
+
+class FakeSite:
+    def __init__(self, url, url_main, regexp, site_type='username', mirrors=None, flags=0):
+        self.url = url
+        self.url_main = url_main
+        self.url_subpath = ''
+        self.url_regexp = re.compile(regexp, flags)
+        self.type = site_type
+        self.mirrors = mirrors or []
+
+
+class FakeDatabase:
+    sites = [
+        FakeSite('https://github.com/{username}', 'https://github.com',
+                 r'^https?://(www\.)?github\.com/(.+?)$'),
+        FakeSite('https://{username}.tumblr.com', 'https://www.tumblr.com',
+                 r'^https?://(.+?)\.tumblr\.com/?$'),
+        FakeSite('{urlMain}/index/8-0-{username}', 'http://antalya.ucoz.ru',
+                 r'^https?://antalya\.ucoz\.ru/index/8-0-(.+?)$'),
+        FakeSite('https://en.wikipedia.org/wiki/User:{username}', 'https://en.wikipedia.org',
+                 r'^https?://en\.wikipedia\.org/wiki/User:(.+?)$', flags=re.IGNORECASE),
+    ]
+
+
+def test_maigret_index_extract_ids():
+    index = MaigretIndex.build(FakeDatabase())
+
+    assert sorted(index.sites) == ['antalya.ucoz.ru', 'en.wikipedia.org', 'github.com', 'tumblr.com']
+    assert index.extract_ids_from_url('https://www.github.com/soxoj') == {'soxoj': 'username'}
+    assert index.extract_ids_from_url('https://soxoj.tumblr.com') == {'soxoj': 'username'}
+    assert index.extract_ids_from_url('http://antalya.ucoz.ru/index/8-0-soxoj') == {'soxoj': 'username'}
+    assert index.extract_ids_from_url('https://t.me/soxoj') == {}
+
+
+def test_maigret_index_keeps_regexp_flags():
+    index = MaigretIndex.build(FakeDatabase())
+    link = Link('https://en.wikipedia.org/wiki/User:Soxoj', '', 'soxoj')
+
+    assert link.url == 'https://en.wikipedia.org/wiki/user:soxoj'
+    assert index.extract_ids_from_url(link.url) == {'soxoj': 'username'}
+
+
+def test_maigret_index_load_from_cache(tmp_path):
+    data_filename = tmp_path / 'data.json'
+    data_filename.write_text('{}')
+    index_filename = tmp_path / 'index.pickle'
+
+    index = MaigretIndex.build(FakeDatabase())
+    with open(index_filename, 'wb') as f:
+        pickle.dump((MaigretIndex.data_version(str(data_filename)), index.sites, index.fallback), f)
+
+    loaded = MaigretIndex.load(str(data_filename), str(index_filename))
+
+    assert loaded.sites == index.sites
+    assert loaded.extract_ids_from_url('https://github.com/soxoj') == {'soxoj': 'username'}
+    assert loaded.extract_ids_from_url('https://en.wikipedia.org/wiki/user:soxoj') == {'soxoj': 'username'}
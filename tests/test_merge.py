@@ -0,0 +1,39 @@
+from marple import *
+
+
+def test_canonical_url():
+    assert canonical_url('https://www.soxoj.com/') == 'soxoj.com'
+    assert canonical_url('http://hub.fastgit.org/soxoj') == 'github.com/soxoj'
+    assert canonical_url('https://github.com.cnpmjs.org/soxoj') == 'github.com/soxoj'
+    assert canonical_url('https://giters.com/soxoj?tab=followers') == 'giters.com/soxoj?tab=followers'
+
+
+def test_merge_links_duplicates():
+    links = [
+        Link('https://github.com/soxoj', 'GitHub', 'soxoj', source='Google'),
+        Link('http://github.com/soxoj', 'GitHub', 'soxoj', source='Bing'),
+        Link('https://www.github.com/soxoj/', 'GitHub', 'soxoj', source='Yahoo'),
+        Link('https://hub.fastgit.org/soxoj', 'GitHub', 'soxoj', source='Aol'),
+        Link('https://github.com.cnpmjs.org/soxoj', 'GitHub', 'soxoj', source='Google'),
+        Link('https://t.me/soxoj', 'Telegram', 'soxoj', source='Bing'),
+        Link('https://books.google.ru/soxoj', 'Book', 'soxoj', source='Google'),
+    ]
+
+    merged = sort_links(merge_links(links, 'soxoj'))
+
+    assert [l.url for l in merged] == ['https://t.me/soxoj', 'http://github.com/soxoj']
+    assert merged[1].sources == ['Google', 'Bing', 'Yahoo', 'Aol']
+
+
+def test_merge_table_links_duplicates():
+    links = [
+        Link('https://github.com/soxoj', 'GitHub', 'soxoj', source='Google'),
+        Link('https://hub.fastgit.org/soxoj', 'GitHub', 'soxoj', source='Aol'),
+        Link('http://github.com/soxoj/', 'GitHub', 'soxoj', source='Bing'),
+        Link('https://t.me/soxoj', 'Telegram', 'soxoj', source='Bing'),
+    ]
+
+    merged = sort_links(merge_links(LinkTable.from_links(links, 'soxoj'), 'soxoj'))
+
+    assert merged.urls == ['https://t.me/soxoj', 'http://github.com/soxoj']
+    assert sorted(list(merged)[1].sources) == ['Aol', 'Bing', 'Google']
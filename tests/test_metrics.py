@@ -0,0 +1,80 @@
+import asyncio
+import json
+import os
+
+from aiohttp import web
+
+from marple import *
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def test_engine_metrics():
+    with open(os.path.join(FIXTURES, 'google_serp.html'), 'rb') as f:
+        html = f.read()
+
+    class LocalGoogleParser(GoogleParser):
+        def make_url(self, username, count, lang):
+            return f'http://127.0.0.1:{port}/search?q={username}'
+
+    class FailingParser(GoogleParser):
+        name = 'Failing'
+
+        def make_url(self, username, count, lang):
+            return f'http://127.0.0.1:{port}/captcha'
+
+    async def search(request):
+        return web.Response(body=html, content_type='text/html')
+
+    async def captcha(request):
+        return web.Response(status=429)
+
+    port = None
+
+    async def run():
+        nonlocal port
+        app = web.Application()
+        app.router.add_get('/search', search)
+        app.router.add_get('/captcha', captcha)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        metrics = {}
+        try:
+            engines = collect_engines([LocalGoogleParser(), FailingParser()], 'soxoj', 100,
+                                      metrics=metrics)
+            async for _ in engines:
+                pass
+        finally:
+            await runner.cleanup()
+
+        return metrics
+
+    metrics = asyncio.run(run())
+    google = metrics['Google scraping']
+
+    assert google.requests == 1
+    assert google.bytes == len(html)
+    assert google.ttfb > 0 and google.connect_time > 0 and google.parse_time > 0
+    assert google.total_time >= google.ttfb
+    assert google.raw_count == 100
+    assert google.error is None
+    assert metrics['Failing'].error == 'BlockedError'
+
+    exported = json.loads(metrics_json({'soxoj': metrics}))
+    assert {m['engine'] for m in exported} == {'Google scraping', 'Failing'}
+
+    prometheus = metrics_prometheus({'soxoj': metrics})
+    assert 'marple_engine_requests_total{engine="Google scraping",username="soxoj"} 1\n' in prometheus
+    assert 'marple_engine_errors_total{engine="Failing",username="soxoj",error_class="BlockedError"} 1\n' in prometheus
+
+
+def test_error_class():
+    assert error_class(None) is None
+    assert error_class(('Bing', 'Timed out after 90s')) == 'TimeoutError'
+    assert error_class(('Bing', 'Got no results')) == 'NoResults'
+    assert error_class(('Bing', 'Error of type "<class \'aiohttp.client_exceptions.ClientConnectorError\'>": no route')) \
+        == 'ClientConnectorError'
@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from marple import *
+
+
+def make_page(page, size=10, name='soxoj'):
+    return [Link(f'https://site{page}-{i}.com/{name}', '', 'soxoj') for i in range(size)]
+
+
+def test_paginate_honors_count():
+    fetched = []
+
+    async def fetch_page(page):
+        fetched.append(page)
+        return make_page(page)
+
+    links = asyncio.run(paginate(fetch_page, 35, 10, wave=3))
+
+    assert len(links) == 35
+    assert fetched == [0, 1, 2, 3]
+
+
+def test_paginate_stops_without_new_username_links():
+    fetched = []
+
+    async def fetch_page(page):
+        fetched.append(page)
+        if page == 0:
+            return make_page(page)
+        if page == 1:
+            # the same links again and junk without username
+            return make_page(0)[:5] + make_page(page, 5, name='junk')
+        return make_page(page)
+
+    links = asyncio.run(paginate(fetch_page, 100, 10, wave=2))
+
+    assert fetched == [0, 1]
+    assert len(links) == 20
+
+
+def test_yield_controller():
+    controller = YieldController(min_yield=0.1, threshold=300)
+
+    assert controller.add_page(make_page(0)) == 1.0
+    assert not controller.exhausted
+
+    # one new profile link among fan pages and long junk URLs
+    page = make_page(1, 1) + [Link(f'https://forum.com/soxojfan{i}', '', 'soxoj') for i in range(10)]
+    page += [Link(f'https://site{i}.com/' + 'a' * 300 + '/soxoj', '', 'soxoj') for i in range(10)]
+    assert controller.add_page(page) == 1 / 21
+    assert controller.exhausted
+
+
+def test_paginate_errors():
+    async def fetch_page(page):
+        if page == 1:
+            raise ValueError('no more pages')
+        return make_page(page)
+
+    assert len(asyncio.run(paginate(fetch_page, 100, 10, wave=3))) == 10
+
+    with pytest.raises(ValueError):
+        asyncio.run(paginate(lambda page: fetch_page(page + 1), 100, 10))
+
+
+class FakeResults(list):
+    def results(self):
+        return list(self)
+
+
+class FakeSearchEngine:
+    """
+        Crawls pages like search_engines engines do
+    """
+    pages = [
+        [{'link': f'https://site{i}.com/soxoj', 'title': ''} for i in range(10)],
+        [{'link': f'https://example.com/page{i}', 'title': ''} for i in range(10)],
+        [{'link': f'https://other{i}.com/soxoj', 'title': ''} for i in range(10)],
+    ]
+
+    def __init__(self, print_func=None, **kwargs):
+        self.requested = []
+
+    def _filter_results(self, page):
+        return self.pages[page]
+
+    def _next_page(self, page):
+        return {'url': page + 1, 'data': None}
+
+    async def search(self, query, pages=20):
+        FakeSearchEngine.last = self
+        results = FakeResults()
+        request = {'url': 0}
+        for _ in range(pages):
+            self.requested.append(request['url'])
+            results += self._filter_results(request['url'])
+            request = self._next_page(request['url'])
+            if request['url'] is None or request['url'] >= len(self.pages):
+                break
+        return results
+
+    async def close(self):
+        pass
+
+
+def test_paginated_engine_stops_early():
+    storage = []
+    err = asyncio.run(PaginatedParser(FakeSearchEngine).run(storage, 'soxoj', count=100))
+
+    assert err is None
+    # the second page has no links with username, the third one is not requested
+    assert FakeSearchEngine.last.requested == [0, 1]
+    assert len(storage) == 20
+
+    storage = []
+    asyncio.run(PaginatedParser(FakeSearchEngine).run(storage, 'soxoj', count=5))
+
+    assert FakeSearchEngine.last.requested == [0]
+    assert len(storage) == 5
+
+
+def test_yield_controller_options():
+    # names of people are not in URLs, so without URL filter any new link counts
+    page = [Link(f'https://site{i}.com/profile/{i}', '', 'john smith') for i in range(10)]
+    assert YieldController(url_filter=True).add_page(page) == 0
+    assert YieldController(url_filter=False).add_page(page) == 1.0
+
+    controller = YieldController(min_yield=0)
+    controller.add_page(page)
+    assert not controller.exhausted
+
+    controller = YieldController(threshold=10)
+    controller.add_page(make_page(0))
+    assert controller.exhausted
+
+
+def test_paginate_options_of_engine_run():
+    class PagesParser:
+        name = 'Pages'
+
+        def __init__(self):
+            self.fetched = []
+
+        async def fetch_page(self, page):
+            self.fetched.append(page)
+            return make_page(page, name='profile')
+
+        async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+            storage += await paginate(self.fetch_page, count, 10, wave=2)
+
+    parser = PagesParser()
+    asyncio.run(run_engine(parser, [], 'soxoj', 40))
+    assert parser.fetched == [0, 1]
+
+    parser = PagesParser()
+    page_yield = dict(min_yield=0, threshold=300, url_filter=True)
+    asyncio.run(run_engine(parser, [], 'soxoj', 40, page_yield=page_yield))
+    assert parser.fetched == [0, 1, 2, 3]
+
+    parser = PagesParser()
+    page_yield = dict(min_yield=0.05, threshold=300, url_filter=False)
+    asyncio.run(run_engine(parser, [], 'soxoj', 40, page_yield=page_yield))
+    assert parser.fetched == [0, 1, 2, 3]
+
+
+def test_paginate_stops_on_last_page_without_min_yield():
+    fetched = []
+
+    async def fetch_page(page):
+        fetched.append(page)
+        return make_page(page) if page == 0 else []
+
+    links = asyncio.run(paginate(fetch_page, 1000, 10, wave=1, controller=YieldController(min_yield=0)))
+    assert len(links) == 10
+    assert fetched == [0, 1]
+
+    fetched.clear()
+
+    async def fetch_short_page(page):
+        fetched.append(page)
+        return make_page(page, size=10 if page < 2 else 4)
+
+    links = asyncio.run(paginate(fetch_short_page, 1000, 10, wave=1, controller=YieldController(min_yield=0)))
+    assert len(links) == 24
+    assert fetched == [0, 1, 2]
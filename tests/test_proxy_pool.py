@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from marple import *
+
+
+PROXIES = ['socks5://10.0.0.1:1080', 'socks5://10.0.0.2:1080', 'socks5://10.0.0.3:1080']
+
+
+def test_round_robin_per_engine():
+    pool = ProxyPool(PROXIES)
+
+    google = [pool.acquire('Google') for _ in range(4)]
+    bing = [pool.acquire('Bing') for _ in range(2)]
+
+    assert google == PROXIES + PROXIES[:1]
+    # the second engine starts from the next proxy
+    assert bing == PROXIES[1:]
+
+
+def test_least_loaded():
+    pool = ProxyPool(PROXIES, strategy='least-loaded')
+
+    assert [pool.acquire('Google') for _ in range(3)] == PROXIES
+
+    pool.release(PROXIES[1])
+    assert pool.acquire('Bing') == PROXIES[1]
+
+
+def test_ejection():
+    pool = ProxyPool(PROXIES[:2], max_failures=2, cooldown=60)
+    blocked = ('Google scraping', 'captcha page instead of results')
+
+    for _ in range(2):
+        pool.load[PROXIES[0]] += 1
+        pool.release(PROXIES[0], blocked)
+
+    assert pool.available() == PROXIES[1:2]
+    assert pool.best() == PROXIES[1]
+    assert {pool.acquire('Google') for _ in range(3)} == {PROXIES[1]}
+
+    # engine errors not related to proxies don't eject
+    for _ in range(3):
+        pool.load[PROXIES[1]] += 1
+        pool.release(PROXIES[1], ('Yandex API search', 'Not found env variable YANDEX_KEY'))
+    assert pool.available() == PROXIES[1:2]
+
+    # all proxies are ejected, the one coming back first is used
+    pool.ejected_until[PROXIES[1]] = time.monotonic() + 120
+    assert pool.available() == PROXIES[:1]
+
+
+def test_ejection_for_errors_of_all_engines():
+    pool = ProxyPool(PROXIES[:2], max_failures=2, cooldown=60)
+    connection_error = exception_error('Bing scraping with pagination', ConnectionResetError('reset by peer'))
+
+    for _ in range(2):
+        pool.load[PROXIES[0]] += 1
+        pool.release(PROXIES[0], connection_error, 'Bing scraping with pagination')
+    assert pool.available() == PROXIES[1:2]
+
+    # the first empty result is not a failure, repeated ones of the same engine are
+    no_results = ('Aol scraping with pagination', 'Got no results')
+    for engine, ejected in [('Aol', False), ('Ask', False), ('Aol', False), ('Aol', True)]:
+        pool.load[PROXIES[1]] += 1
+        pool.release(PROXIES[1], no_results, engine)
+        assert (PROXIES[1] in pool.ejected_until) == ejected
+
+
+def test_engines_use_pool():
+    used = []
+
+    class FakeParser:
+        name = 'Fake'
+
+        async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+            used.append((proxy, session))
+
+    class FakeSessionPool:
+        async def get(self, proxy=None):
+            return f'session {proxy}'
+
+        async def close(self):
+            pass
+
+    async def run():
+        pool = ProxyPool(PROXIES[:2])
+        for _ in range(2):
+            async for _ in collect_engines([FakeParser()], 'soxoj', 100, proxy_pool=pool,
+                                           session_pool=FakeSessionPool()):
+                pass
+        return pool
+
+    pool = asyncio.run(run())
+
+    assert used == [(p, f'session {p}') for p in PROXIES[:2]]
+    assert set(pool.load.values()) == {0}
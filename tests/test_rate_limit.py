@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from marple import *
+
+
+def test_rate_limiter_backoff_and_recover():
+    limiter = RateLimiter(rate=1.0, burst=1)
+
+    limiter.backoff()
+    limiter.backoff()
+    assert limiter.rate == 0.25
+
+    for _ in range(20):
+        limiter.recover()
+    assert limiter.rate == 1.0
+
+    for _ in range(20):
+        limiter.backoff()
+    assert limiter.rate == limiter.min_rate
+
+
+def test_rate_limiter_acquire_throttles():
+    limiter = RateLimiter(rate=20.0, burst=1)
+
+    async def acquire_all():
+        for _ in range(3):
+            await limiter.acquire()
+
+    start = time.monotonic()
+    asyncio.run(acquire_all())
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_is_blocking_error():
+    assert is_blocking_error(('Google scraping', 'Got no results'))
+    assert is_blocking_error(('Google scraping', BlockedError('429 Too Many Requests')))
+    assert is_blocking_error(('Bing', 'Error of type "<class \'aiohttp.ClientResponseError\'>": 429, message=\'\''))
+    assert not is_blocking_error(('Yandex API search', 'Not found env variable'))
+    assert not is_blocking_error(('Torch', 'Timed out after 429s'))
+    assert not is_blocking_error(('Bing', 'Error of type "<class \'ValueError\'>": bad page https://bing.com/429'))
+    assert not is_blocking_error(None)
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self):
+        self.acquired += 1
+
+    def backoff(self):
+        pass
+
+    def recover(self):
+        pass
+
+
+class CountingRateLimits(RateLimits):
+    def get(self, parser, proxy=None):
+        return self.limiters.setdefault(parser.name, CountingLimiter())
+
+
+def test_rate_limit_token_for_every_page():
+    class PagesParser:
+        name = 'Pages'
+
+        async def fetch_page(self, page):
+            return [Link(f'https://site{page}-{i}.com/soxoj', '', 'soxoj') for i in range(10)]
+
+        async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+            storage += await paginate(self.fetch_page, count, 10)
+
+    rate_limits = CountingRateLimits()
+    asyncio.run(run_engine(PagesParser(), [], 'soxoj', 50, rate_limits=rate_limits))
+
+    assert rate_limits.limiters['Pages'].acquired == 5
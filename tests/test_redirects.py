@@ -0,0 +1,124 @@
+import asyncio
+import os
+import re
+
+import aiohttp
+from aiohttp import web
+
+import marple as marple_module
+from marple import *
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def test_local_redirect_target():
+    assert local_redirect_target('https://www.google.com/url?q=https://github.com/soxoj&sa=U') == \
+        'https://github.com/soxoj'
+    assert local_redirect_target('https://duckduckgo.com/l/?uddg=https%3A%2F%2Ft.me%2Fsoxoj') == 'https://t.me/soxoj'
+    assert local_redirect_target('https://github.com/soxoj') is None
+
+
+def test_resolve_urls(tmp_path, monkeypatch):
+    requests = []
+
+    async def head_redirect(request):
+        requests.append(request.method)
+        raise web.HTTPFound('https://github.com/soxoj')
+
+    async def get_redirect(request):
+        requests.append(request.method)
+        if request.method == 'HEAD':
+            raise web.HTTPMethodNotAllowed('HEAD', ['GET'])
+        raise web.HTTPFound('/soxoj')
+
+    async def run():
+        app = web.Application()
+        app.router.add_route('*', '/link/head', head_redirect)
+        app.router.add_route('*', '/link/get', get_redirect)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(marple_module, 'remote_redirect_regexp', re.compile(f'^http://127.0.0.1:{port}/link/'))
+
+        urls = [
+            f'http://127.0.0.1:{port}/link/head',
+            f'http://127.0.0.1:{port}/link/get',
+            'https://www.google.com/url?q=https://t.me/soxoj',
+            'https://vk.com/soxoj',
+        ]
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                cache = SerpCache(str(tmp_path / 'cache.sqlite'))
+                targets = await RedirectResolver(cache).resolve_urls(urls, session)
+                cache.close()
+
+                # targets are taken from the persistent cache now
+                cache = SerpCache(str(tmp_path / 'cache.sqlite'))
+                cached = await RedirectResolver(cache).resolve_urls(urls, session)
+                cache.close()
+        finally:
+            await runner.cleanup()
+
+        return port, targets, cached
+
+    port, targets, cached = asyncio.run(run())
+
+    assert targets == [
+        'https://github.com/soxoj',
+        f'http://127.0.0.1:{port}/soxoj',
+        'https://t.me/soxoj',
+        'https://vk.com/soxoj',
+    ]
+    assert cached == targets
+    assert requests == ['HEAD', 'HEAD', 'GET']
+
+
+def test_engines_resolve_links_with_their_session_and_proxy(monkeypatch):
+    calls = []
+
+    class FakeResolver:
+        async def resolve_urls(self, urls, session=None, proxy=None):
+            calls.append((session, proxy))
+            return urls
+
+    class FakeSession:
+        pass
+
+    monkeypatch.setattr(marple_module, 'redirect_resolver', FakeResolver())
+    with open(os.path.join(FIXTURES, 'google_serp.html'), encoding='utf-8') as f:
+        html = f.read()
+
+    session = FakeSession()
+    asyncio.run(GoogleParser().parse(html, 'soxoj', session, 'http://127.0.0.1:8080'))
+    asyncio.run(DuckParserOld().parse(html, 'soxoj', session, 'http://127.0.0.1:8080'))
+
+    assert calls == [(session, 'http://127.0.0.1:8080')] * 2
+
+
+def test_resolver_limits_requests_of_all_searches(monkeypatch):
+    state = {'active': 0, 'max_active': 0}
+    monkeypatch.setattr(marple_module, 'remote_redirect_regexp', re.compile('^https://t.co/'))
+
+    class FakeResolver(RedirectResolver):
+        async def fetch_location(self, url, session):
+            state['active'] += 1
+            state['max_active'] = max(state['max_active'], state['active'])
+            await asyncio.sleep(0.02)
+            state['active'] -= 1
+            return url.replace('https://t.co/', 'https://github.com/')
+
+    resolver = FakeResolver(concurrency=3)
+
+    async def run():
+        searches = [resolver.resolve_urls([f'https://t.co/{i}-{j}' for j in range(5)], session=object())
+                    for i in range(4)]
+        return await asyncio.gather(*searches)
+
+    targets = asyncio.run(run())
+
+    assert targets[1][2] == 'https://github.com/1-2'
+    assert state['max_active'] == 3
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+
+import pytest
+import requests
+from aiohttp import web
+
+from marple import *
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+async def run_marple(session_pool, engines, count=100):
+    try:
+        return await marple('john', count, False, custom_engines=engines, progress=False,
+                            session_pool=session_pool)
+    finally:
+        await session_pool.close()
+
+
+def test_record_and_replay(tmp_path):
+    html = read_fixture('google_serp.html')
+    path = str(tmp_path / 'recording')
+
+    class LocalGoogleParser(GoogleParser):
+        def make_url(self, username, count, lang):
+            return f'http://127.0.0.1:{port}/search?q={username}'
+
+    async def search(request):
+        return web.Response(body=html, content_type='text/html')
+
+    async def run(session_pool):
+        try:
+            links = []
+            session = await session_pool.get()
+            err = await LocalGoogleParser().run(links, 'john', session=session)
+            return links, err
+        finally:
+            await session_pool.close()
+
+    port = None
+
+    async def record():
+        nonlocal port
+        app = web.Application()
+        app.router.add_get('/search', search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        try:
+            return await run(RecordingSessionPool(path))
+        finally:
+            await runner.cleanup()
+
+    recorded, err = asyncio.run(record())
+    # server is stopped, responses come from the recording
+    replayed, replay_err = asyncio.run(run(ReplaySessionPool(path)))
+
+    assert err is None and replay_err is None
+    assert len(recorded) == 100
+    assert [l.url for l in replayed] == [l.url for l in recorded]
+
+
+def test_marple_offline(tmp_path):
+    path = str(tmp_path / 'recording')
+    url = GoogleParser().make_url('john', 100, 'en')
+    write_recording(path, 'GET', url, RecordedResponse(200, {}, read_fixture('google_serp.html')))
+
+    result = asyncio.run(run_marple(ReplaySessionPool(path), ['google']))
+
+    assert not any(result.errors)
+    assert len(result.all_links) == 100
+
+
+def test_replay_missing(tmp_path):
+    async def run():
+        session_pool = ReplaySessionPool(str(tmp_path))
+        try:
+            session = await session_pool.get()
+            async with session.get('https://www.google.com/search?q=john'):
+                pass
+        finally:
+            await session_pool.close()
+
+    with pytest.raises(ReplayMissingError):
+        asyncio.run(run())
+
+
+def test_replay_fails_engines_without_session(tmp_path, monkeypatch):
+    monkeypatch.setenv('YANDEX_USER', 'user')
+    monkeypatch.setenv('YANDEX_KEY', 'key')
+    path = str(tmp_path / 'recording')
+    url = GoogleParser().make_url('john', 100, 'en')
+    write_recording(path, 'GET', url, RecordedResponse(200, {}, read_fixture('google_serp.html')))
+
+    result = asyncio.run(run_marple(ReplaySessionPool(path), ['google', 'bing', 'yandex']))
+
+    errors = {e[0]: error_class(e) for e in result.errors if e}
+    # Yandex has no recorded responses, Bing doesn't request through session or requests
+    assert errors == {BingParser.name: 'ReplayMissingError', YandexParser.name: 'ReplayMissingError'}
+    assert result.metrics[BingParser.name].requests == 0
+    assert len(result.all_links) == 100
+
+
+def fake_sdk_send(session, request, **kwargs):
+    """
+        SerpApi and Yandex XML backends
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.url = request.url
+    response.request = request
+
+    if request.url.startswith('https://serpapi.com/'):
+        results = [{'link': f'https://site{i}.com/john', 'title': ''} for i in range(10)]
+        response._content = json.dumps({'organic_results': results}).encode()
+    else:
+        docs = ''.join(
+            f'<group><doc><url>https://yandex{i}.com/john</url><domain>yandex{i}.com</domain>'
+            f'<title>john</title></doc></group>' for i in range(5)
+        )
+        response._content = (
+            f'<yandexsearch><response date="20260101T000000"><reqid>1</reqid>'
+            f'<found priority="all">5</found><results><grouping>{docs}</grouping></results>'
+            f'</response></yandexsearch>'
+        ).encode()
+
+    return response
+
+
+def test_record_and_replay_sdk_engines(tmp_path, monkeypatch):
+    path = str(tmp_path / 'recording')
+    engines = ['yandex', 'naver', 'baidu']
+    monkeypatch.setenv('YANDEX_USER', 'user')
+    monkeypatch.setenv('YANDEX_KEY', 'secret-yandex-key')
+    monkeypatch.setenv('SERPAPI_KEY', 'secret-serpapi-key')
+    monkeypatch.setattr(requests.Session, 'send', fake_sdk_send)
+
+    recorded = asyncio.run(run_marple(RecordingSessionPool(path), engines, 20))
+    assert requests.Session.send is fake_sdk_send
+
+    def network_send(session, request, **kwargs):
+        raise AssertionError(f'network request to {request.url}')
+
+    # keys are not saved to recordings and are not needed to replay
+    monkeypatch.setattr(requests.Session, 'send', network_send)
+    monkeypatch.setenv('YANDEX_KEY', 'other')
+    monkeypatch.setenv('SERPAPI_KEY', 'other')
+    replayed = asyncio.run(run_marple(ReplaySessionPool(path), engines, 20))
+    assert requests.Session.send is network_send
+
+    assert not any(recorded.errors) and not any(replayed.errors)
+    assert len(recorded.unique_links) == 15
+    assert [l.url for l in replayed.unique_links] == [l.url for l in recorded.unique_links]
+    assert not any('secret' in open(os.path.join(path, f)).read() for f in os.listdir(path))
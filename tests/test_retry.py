@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import aiohttp
+
+import marple as marple_module
+from marple import *
+
+
+class FlakyParser:
+    name = 'Flaky'
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+        self.calls += 1
+        if self.errors:
+            return self.name, self.errors.pop(0)
+
+        storage.append(Link('https://github.com/soxoj', '', username, source=self.name))
+
+
+def test_retry_transient_errors(monkeypatch):
+    monkeypatch.setattr(marple_module, 'retry_delay', lambda attempt: 0)
+    connection_error = 'Error of type "<class \'aiohttp.client_exceptions.ClientConnectorError\'>": refused'
+    disconnected = 'Error of type "<class \'aiohttp.client_exceptions.ServerDisconnectedError\'>": closed'
+    parser = FlakyParser([connection_error, disconnected])
+    links = []
+    metrics = EngineMetrics(parser.name)
+
+    err = asyncio.run(run_engine(parser, links, 'soxoj', 10, retries=2, metrics=metrics))
+
+    assert err is None
+    assert parser.calls == 3
+    assert metrics.retries == 2
+    assert len(links) == 1
+
+
+def test_no_retry_of_captcha():
+    parser = FlakyParser(['captcha page instead of results'])
+
+    err = asyncio.run(run_engine(parser, [], 'soxoj', 10, retries=2))
+
+    assert error_class(err) == 'BlockedError'
+    assert parser.calls == 1
+
+
+class SlowParser(FlakyParser):
+    timeout = 0.3
+
+    def __init__(self, errors, delay):
+        super().__init__(errors)
+        self.delay = delay
+
+    async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+        await asyncio.sleep(self.delay)
+        return await super().run(storage, username, count, lang, proxy, session)
+
+
+def test_retries_share_engine_timeout(monkeypatch):
+    monkeypatch.setattr(marple_module, 'retry_delay', lambda attempt: 0)
+    connection_error = 'Error of type "<class \'aiohttp.client_exceptions.ClientConnectorError\'>": refused'
+
+    # timed out engine is not retried
+    parser = SlowParser([], delay=10)
+    err = asyncio.run(run_engine(parser, [], 'soxoj', 10, retries=2))
+    assert err == ('Flaky', 'Timed out after 0.3s')
+    assert parser.calls == 0
+
+    # slow failures are retried only for the rest of the engine timeout
+    parser = SlowParser([connection_error] * 3, delay=0.2)
+    start = time.monotonic()
+    err = asyncio.run(run_engine(parser, [], 'soxoj', 10, retries=2))
+    assert time.monotonic() - start < 0.45
+    assert parser.calls == 1
+    # the retry had only the rest of the budget
+    assert err == ('Flaky', 'Timed out after 0.1s')
+
+
+def test_retry_delay_is_jittered():
+    delays = [retry_delay(3, base=1.0, cap=5.0) for _ in range(100)]
+
+    assert all(0 <= d <= 5.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_circuit_breaker(monkeypatch):
+    parser = FlakyParser(['Error of type "<class \'OSError\'>": no tor'] * 3)
+    breakers = CircuitBreakers(threshold=2, cooldown=60)
+
+    async def run():
+        return [await run_engine(parser, [], 'soxoj', 10, breakers=breakers) for _ in range(3)]
+
+    errors = asyncio.run(run())
+
+    assert parser.calls == 2
+    assert error_class(errors[2]) == 'CircuitOpen'
+
+    # after cooldown one trial run is allowed and closes the breaker on success
+    breaker = breakers.get(parser)
+    breaker.opened_at -= 60
+    parser.errors = []
+    assert asyncio.run(run_engine(parser, [], 'soxoj', 10, breakers=breakers)) is None
+    assert breaker.opened_at is None and breaker.allow()
+
+
+class BrokenSearchEngine:
+    calls = 0
+
+    def __init__(self, print_func=None, **kwargs):
+        pass
+
+    async def search(self, query, pages=20):
+        BrokenSearchEngine.calls += 1
+        raise aiohttp.ClientConnectionError('connection lost')
+
+    async def close(self):
+        pass
+
+
+def test_retry_errors_of_all_engines(monkeypatch):
+    monkeypatch.setattr(marple_module, 'retry_delay', lambda attempt: 0)
+
+    err = asyncio.run(run_engine(PaginatedParser(BrokenSearchEngine), [], 'soxoj', 10, retries=2))
+
+    assert error_class(err) == 'ClientConnectionError'
+    assert BrokenSearchEngine.calls == 3
+    assert is_transient_error(exception_error('Yandex API search', ConnectionResetError('reset by peer')))
+    assert not is_transient_error(exception_error('Yandex API search', ValueError('bad response')))
+
+
+def test_queued_time_is_not_spent_from_retries_budget(monkeypatch):
+    monkeypatch.setattr(marple_module, 'retry_delay', lambda attempt: 0)
+    connection_error = 'Error of type "<class \'aiohttp.client_exceptions.ClientConnectorError\'>": refused'
+    scheduler = Scheduler(concurrency=10, engine_concurrency=1)
+
+    async def run():
+        parsers = [SlowParser([connection_error], delay=0.1) for _ in range(6)]
+        for parser in parsers:
+            parser.timeout = 0.5
+        errors = await asyncio.gather(*[
+            run_engine(parser, [], f'user{i}', 10, retries=2, scheduler=scheduler)
+            for i, parser in enumerate(parsers)
+        ])
+        return parsers, errors
+
+    parsers, errors = asyncio.run(run())
+
+    assert errors == [None] * 6
+    assert [p.calls for p in parsers] == [2] * 6
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import json
+
+import aiohttp
+from aiohttp import web
+
+import marple as marple_module
+from marple import *
+
+
+class FakeParser:
+    def __init__(self, name, urls, delay=0.0):
+        self.name = name
+        self.urls = urls
+        self.delay = delay
+
+    async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+        await asyncio.sleep(self.delay)
+        storage += [Link(u, '', username, source=self.name) for u in self.urls]
+
+
+def make_args(**kwargs):
+    options = dict(
+        max_searches=1, concurrency=20, engine_concurrency=4, breaker_threshold=3,
+        breaker_cooldown=600, engines=None, threshold=300, url_filter=True, results_count=100,
+        proxy=None, proxy_pool=None, deadline=None, engine_timeout=None, retries=0, plugins=[],
+        min_page_yield=0.05,
+    )
+    options.update(kwargs)
+    return argparse.Namespace(**options)
+
+
+def test_server_streams_ndjson(monkeypatch):
+    created = []
+
+    def make_parsers(engines):
+        created.append(engines)
+        return [
+            FakeParser('Fast', ['https://t.me/soxoj']),
+            FakeParser('Slow', ['https://github.com/soxoj'], delay=0.3),
+        ]
+
+    monkeypatch.setattr(marple_module, 'make_parsers', make_parsers)
+
+    async def run():
+        session_pool = SessionPool()
+        runner = web.AppRunner(make_server(make_args(), session_pool))
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                resp = await session.get(f'{url}/search?username=soxoj')
+                # the first link comes before the slow engine is finished
+                first_line = json.loads(await resp.content.readline())
+
+                async with session.get(f'{url}/search?username=soxoj') as busy:
+                    busy_status = busy.status
+
+                rest = [json.loads(l) for l in (await resp.text()).splitlines()]
+
+                async with session.post(f'{url}/search', json={'username': 'soxoj'}) as again:
+                    lines = (await again.text()).splitlines()
+        finally:
+            await runner.cleanup()
+            await session_pool.close()
+
+        return first_line, busy_status, rest, lines
+
+    first_line, busy_status, rest, lines = asyncio.run(run())
+
+    assert first_line['url'] == 'https://t.me/soxoj'
+    assert busy_status == 503
+    assert rest[0]['url'] == 'https://github.com/soxoj'
+    assert rest[1]['username'] == 'soxoj' and rest[1]['errors'] == []
+    assert {m['engine'] for m in rest[1]['metrics']} == {'Fast', 'Slow'}
+    assert len(lines) == 3
+    # parsers are created once and reused between searches
+    assert created == [()]
+
+
+def test_server_bad_request(monkeypatch):
+    monkeypatch.setattr(marple_module, 'make_parsers', lambda engines: [FakeParser('Fast', [])])
+
+    async def run():
+        session_pool = SessionPool()
+        runner = web.AppRunner(make_server(make_args(), session_pool))
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                statuses = []
+                for query in ['', 'username=soxoj&count=many', 'username=soxoj&threshold=1.5',
+                              'username=soxoj&engines=nope']:
+                    async with session.get(f'{url}/search?{query}') as resp:
+                        statuses.append(resp.status)
+        finally:
+            await runner.cleanup()
+            await session_pool.close()
+
+        return statuses
+
+    assert asyncio.run(run()) == [400] * 4
@@ -0,0 +1,81 @@
+import asyncio
+
+import marple as marple_module
+from marple import *
+
+
+URLS = [
+    'https://github.com/soxoj',
+    'http://github.com/soxoj',
+    'https://www.github.com/soxoj/',
+    'https://t.me/soxoj',
+    'https://t.me/soxoj?start=1',
+    'https://example.com/alex',
+    'https://vk.com/soxoj',
+    'http://vk.com/soxoj',
+    'https://books.google.ru/soxoj',
+    'https://example.com/files/soxoj.pdf',
+]
+
+
+def make_table():
+    links = [Link(u, '', 'soxoj', source=f'Engine{i % 3}') for i, u in enumerate(URLS * 3)]
+    return LinkTable.from_links(links, 'soxoj')
+
+
+def describe(table):
+    return [
+        (l.url, sorted(l.sources), l.filtered, table.is_likely_profile(i, 300), table.is_pdf(i))
+        for i, l in enumerate(table)
+    ]
+
+
+def test_sharded_merge_equals_sequential():
+    for filter_by_urls in (True, False):
+        expected = describe(sort_links(merge_links(make_table(), 'soxoj', filter_by_urls)))
+
+        # chunks of the same and different sizes, duplicates inside and between chunks
+        for partitions in (1, 3, 4, 7):
+            sharded = asyncio.run(merge_links_sharded(make_table(), filter_by_urls, partitions=partitions))
+
+            assert isinstance(sharded, LinkTable)
+            assert describe(sharded) == expected
+
+
+def test_sharded_merge_keeps_merged_sources():
+    table = merge_links(make_table(), 'soxoj')
+    table.extend(make_table())
+
+    expected = describe(sort_links(merge_links(table.take(range(len(table))), 'soxoj')))
+    sharded = asyncio.run(merge_links_sharded(table, partitions=4))
+
+    assert describe(sharded) == expected
+    github = sharded.link(sharded.urls.index('http://github.com/soxoj'))
+    assert sorted(github.sources) == ['Engine0', 'Engine1', 'Engine2']
+
+
+def test_marple_shards_merge_of_compact_results(monkeypatch):
+    class ListParser:
+        name = 'Google'
+
+        async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+            storage += [Link(u, '', username, source=self.name) for u in URLS * 3]
+
+    def run(compact):
+        return asyncio.run(marple('soxoj', 100, True, progress=False, parsers=[ListParser()], compact=compact))
+
+    monkeypatch.setattr(marple_module, 'sharding_threshold', 10)
+    monkeypatch.setattr(marple_module, 'merge_workers', 3)
+    calls = []
+    sharded_merge = marple_module.merge_links_sharded
+
+    async def merge_links_sharded(*args):
+        calls.append(len(args[0]))
+        return await sharded_merge(*args)
+
+    monkeypatch.setattr(marple_module, 'merge_links_sharded', merge_links_sharded)
+
+    result, compact = run(False), run(True)
+
+    assert calls == [len(URLS) * 3]
+    assert compact.unique_links.urls == [l.url for l in result.unique_links]
@@ -0,0 +1,61 @@
+import asyncio
+
+import aiohttp
+import socid_extractor
+from aiohttp import web
+
+from marple import *
+
+
+def test_socid_extract(monkeypatch):
+    monkeypatch.setattr(socid_extractor, 'extract', lambda html: {'uid': html})
+    state = {'active': 0, 'max_active': 0}
+
+    async def page(request):
+        state['active'] += 1
+        state['max_active'] = max(state['max_active'], state['active'])
+        try:
+            await asyncio.sleep(0.05)
+            return web.Response(text=request.match_info['page'])
+        finally:
+            state['active'] -= 1
+
+    async def hung(request):
+        await asyncio.sleep(1)
+        return web.Response(text='')
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/hung/soxoj', hung)
+        app.router.add_get('/{page}/soxoj', page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+        def make_links():
+            urls = [f'{url}/page{i}/soxoj' for i in range(4)] + [f'{url}/hung/soxoj']
+            # junk link is not fetched
+            urls.append(f'{url}/page0/' + 'a' * 300 + '/soxoj')
+            return [Link(u, '', 'soxoj') for u in urls]
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                links = make_links()
+                errors = await socid_extract_result(MarpleResult([], links, [], []), session, 300,
+                                                    per_host=2, timeout=0.5)
+
+                table = merge_links(LinkTable.from_links(make_links(), 'soxoj'), 'soxoj')
+                await socid_extract_result(MarpleResult([], table, [], []), session, 300, timeout=0.5)
+        finally:
+            await runner.cleanup()
+
+        return links, errors, table
+
+    links, errors, table = asyncio.run(run())
+
+    assert [l.ids for l in links] == [{'uid': f'page{i}'} for i in range(4)] + [{}, None]
+    assert [(l.url, type(e)) for l, e in errors] == [(links[4].url, asyncio.TimeoutError)]
+    assert state['max_active'] == 2
+    assert [table.ids.get(i) for i in range(len(table))] == [{'uid': f'page{i}'} for i in range(4)] + [{}, None]
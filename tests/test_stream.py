@@ -0,0 +1,84 @@
+import asyncio
+
+import marple as marple_module
+from marple import *
+
+
+class FakeParser:
+    def __init__(self, name, urls, delay=0, error=None):
+        self.name = name
+        self.urls = urls
+        self.delay = delay
+        self.error = error
+
+    async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+        await asyncio.sleep(self.delay)
+        storage += [Link(u, '', username, source=self.name) for u in self.urls]
+        if self.error:
+            return self.name, self.error
+
+
+def test_marple_stream(monkeypatch):
+    parsers = [
+        FakeParser('Slow', ['https://github.com/soxoj', 'https://t.me/soxoj'], delay=0.2),
+        FakeParser('Fast', ['http://github.com/soxoj/'], delay=0.01),
+        FakeParser('Broken', [], error='Got no results'),
+    ]
+    monkeypatch.setattr(marple_module, 'make_parsers', lambda engines: parsers)
+
+    async def collect():
+        errors = []
+        links = []
+        async for link in marple_stream('soxoj', 10, True, errors=errors):
+            links.append(link)
+        return links, errors
+
+    links, errors = asyncio.run(collect())
+
+    assert [l.url for l in links] == ['http://github.com/soxoj', 'https://t.me/soxoj']
+    assert links[0].sources == ['Fast', 'Slow']
+    assert errors == [('Broken', 'Got no results')]
+
+
+def test_marple_deadline_returns_partial_results(monkeypatch):
+    parsers = [
+        FakeParser('Fast', ['https://t.me/soxoj'], delay=0.01),
+        FakeParser('Hung', ['https://github.com/soxoj'], delay=10),
+    ]
+    monkeypatch.setattr(marple_module, 'make_parsers', lambda engines: parsers)
+
+    result = asyncio.run(marple('soxoj', 10, True, progress=False, timeout=0.2))
+
+    assert [l.url for l in result.unique_links] == ['https://t.me/soxoj']
+    assert [e[0] for e in result.errors if e] == ['Hung']
+
+
+def test_marple_engine_timeout(monkeypatch):
+    parsers = [
+        FakeParser('Fast', ['https://t.me/soxoj'], delay=0.01),
+        FakeParser('Hung', ['https://github.com/soxoj'], delay=10),
+    ]
+    monkeypatch.setattr(marple_module, 'make_parsers', lambda engines: parsers)
+
+    result = asyncio.run(marple('soxoj', 10, True, progress=False, engine_timeout=0.2))
+
+    assert [l.url for l in result.unique_links] == ['https://t.me/soxoj']
+    assert [e for e in result.errors if e] == [('Hung', 'Timed out after 0.2s')]
+
+
+class HangingParser:
+    name = 'Hanging'
+
+    async def run(self, storage, username, count=100, lang='en', proxy=None, session=None):
+        storage.append(Link('https://github.com/soxoj', '', username, source=self.name))
+        await asyncio.sleep(10)
+
+
+def test_marple_deadline_keeps_links_of_cancelled_engines(monkeypatch):
+    parsers = [FakeParser('Fast', ['https://t.me/soxoj'], delay=0.01), HangingParser()]
+    monkeypatch.setattr(marple_module, 'make_parsers', lambda engines: parsers)
+
+    result = asyncio.run(marple('soxoj', 10, True, progress=False, timeout=0.2, retries=0))
+
+    assert sorted(l.url for l in result.unique_links) == ['https://github.com/soxoj', 'https://t.me/soxoj']
+    assert [e[0] for e in result.errors if e] == ['Hanging']